@@ -1,6 +1,6 @@
 import os
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from pydantic import BaseModel
 
 class HiveConfig(BaseModel):
@@ -17,23 +17,39 @@ class ServerConfig(BaseModel):
     port: int = 8008
     max_rows: int = 1000
 
+class LogCategoryConfig(BaseModel):
+    sample_rate: float = 1.0
+    rate_limit: Optional[float] = None  # records per second, None for unlimited
+
+class LoggingConfig(BaseModel):
+    level: Literal["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"] = "INFO"
+    max_query_chars: int = 500
+    access: LogCategoryConfig = LogCategoryConfig(rate_limit=100)
+    query: LogCategoryConfig = LogCategoryConfig(rate_limit=50)
+    error: LogCategoryConfig = LogCategoryConfig(rate_limit=20)
+
 class Config(BaseModel):
     hive: HiveConfig
     allowed_origins: Optional[List[str]] = None
     server: ServerConfig = ServerConfig()
+    logging: LoggingConfig = LoggingConfig()
+
+    @staticmethod
+    def resolve_path(config_path: str = "config.json") -> Optional[str]:
+        """Return the config file that load() would read, or None if there is none."""
+        if os.path.exists(config_path):
+            return config_path
+        # Look in the parent directory if not found (common in dev).
+        parent_config = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.json")
+        if os.path.exists(parent_config):
+            return parent_config
+        return None
 
     @classmethod
     def load(cls, config_path: str = "config.json") -> "Config":
-        if not os.path.exists(config_path):
-             # Fallback to creating a default config if not found, or raising error
-             # For now, let's assume it might not exist and return defaults, 
-             # but in this project config.json is expected.
-             # Let's try to look in the parent directory if not found (common in dev).
-             parent_config = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.json")
-             if os.path.exists(parent_config):
-                 config_path = parent_config
-             else:
-                 return cls(hive=HiveConfig()) # Return default
+        config_path = cls.resolve_path(config_path)
+        if config_path is None:
+            return cls(hive=HiveConfig()) # Return default
 
         with open(config_path, "r") as f:
             data = json.load(f)
@@ -56,5 +72,39 @@ class Config(BaseModel):
             d["hive"]["password"] = "***"
         return d
 
+    def update_from(self, other: "Config"):
+        """Copy every field of `other` onto this instance in place.
+
+        Modules hold a reference to the global `config` object, so a reload
+        must mutate it rather than rebind the name.
+        """
+        for name in type(self).model_fields:
+            setattr(self, name, getattr(other, name))
+
+def config_mtime() -> Optional[float]:
+    """Modification time of the active config file, or None if there is none."""
+    path = Config.resolve_path()
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+def reload_config() -> bool:
+    """Re-read config.json into the global config. Returns True if anything changed.
+
+    Raises FileNotFoundError if the file is gone; the current config is kept
+    rather than falling back to the built-in defaults.
+    """
+    config_path = Config.resolve_path()
+    if config_path is None:
+        raise FileNotFoundError("config.json not found")
+    new_config = Config.load(config_path)
+    if new_config == config:
+        return False
+    config.update_from(new_config)
+    return True
+
 # Global config instance
 config = Config.load()
@@ -0,0 +1,147 @@
+import json
+from array import array
+from json.encoder import encode_basestring
+from typing import List
+
+# TColumn field -> array typecode. String and binary columns stay as lists.
+_TYPECODES = {
+    "boolVal": "b",
+    "byteVal": "b",
+    "i16Val": "h",
+    "i32Val": "i",
+    "i64Val": "q",
+    "doubleVal": "d",
+}
+_TCOLUMN_FIELDS = ("boolVal", "byteVal", "i16Val", "i32Val", "i64Val", "doubleVal", "stringVal", "binaryVal")
+
+
+# repr() -> json.dumps spelling for non-finite floats
+_NON_FINITE = {"nan": "NaN", "inf": "Infinity", "-inf": "-Infinity"}
+
+
+def _float_tokens(values) -> List[str]:
+    tokens = list(map(float.__repr__, values))
+    if "nan" in tokens or "inf" in tokens or "-inf" in tokens:
+        tokens = [_NON_FINITE.get(t, t) for t in tokens]
+    return tokens
+
+
+class Column:
+    """One result column: typed values plus the HiveServer2 null bitmap (bit i set = row i is null)."""
+
+    __slots__ = ("name", "kind", "values", "nulls", "has_nulls")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.kind = None
+        self.values = None
+        self.nulls = bytearray()
+        self.has_nulls = False
+
+    def __len__(self):
+        return len(self.values) if self.values is not None else 0
+
+    def append_tcolumn(self, tcolumn):
+        """Append one TColumn batch from a TRowSet. Returns the number of rows added."""
+        for kind in _TCOLUMN_FIELDS:
+            wrapper = getattr(tcolumn, kind, None)
+            if wrapper is not None:
+                break
+        else:
+            return 0
+
+        offset = len(self)
+        if self.values is None:
+            self.kind = kind
+            typecode = _TYPECODES.get(kind)
+            self.values = array(typecode) if typecode else []
+        if isinstance(self.values, array):
+            self.values.fromlist(wrapper.values)
+        else:
+            self.values.extend(wrapper.values)
+
+        self._append_nulls(wrapper.nulls, offset, len(self))
+        return len(self) - offset
+
+    def _append_nulls(self, nulls: bytes, offset: int, length: int):
+        self.nulls.extend(bytes((length + 7) // 8 - len(self.nulls)))
+        if not any(nulls):
+            return
+        self.has_nulls = True
+        if offset % 8 == 0:
+            start = offset // 8
+            for i, byte in enumerate(nulls[:len(self.nulls) - start]):
+                self.nulls[start + i] |= byte
+            return
+        for i, byte in enumerate(nulls):
+            if byte:
+                for b in range(8):
+                    if byte & (1 << b):
+                        row = offset + i * 8 + b
+                        if row < length:
+                            self.nulls[row >> 3] |= 1 << (row & 7)
+
+    def null_rows(self):
+        """Indexes of null rows, skipping bitmap bytes with no nulls."""
+        if not self.has_nulls:
+            return
+        length = len(self)
+        for i, byte in enumerate(self.nulls):
+            if byte:
+                for b in range(8):
+                    if byte & (1 << b) and i * 8 + b < length:
+                        yield i * 8 + b
+
+    def truncate(self, length: int):
+        if length >= len(self):
+            return
+        del self.values[length:]
+        del self.nulls[(length + 7) // 8:]
+        if length % 8:
+            self.nulls[-1] &= (1 << (length % 8)) - 1
+
+    def json_tokens(self) -> List[str]:
+        """Each value encoded as a JSON token, column at a time."""
+        if self.values is None:
+            return []
+        if self.kind == "boolVal":
+            tokens = [("false", "true")[v] for v in self.values]
+        elif self.kind == "doubleVal":
+            tokens = _float_tokens(self.values)
+        elif self.kind == "stringVal":
+            tokens = list(map(encode_basestring, self.values))
+        elif self.kind == "binaryVal":
+            tokens = [encode_basestring(str(v)) for v in self.values]
+        else:
+            tokens = list(map(int.__repr__, self.values))
+        for row in self.null_rows():
+            tokens[row] = "null"
+        return tokens
+
+
+class ColumnarResult:
+    """Query result held as columns, encoded to JSON without building row tuples."""
+
+    def __init__(self, columns: List[Column], truncated: bool = False):
+        self.columns = columns
+        self.truncated = truncated
+
+    @property
+    def row_count(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def to_json(self) -> str:
+        """The {columns, data, row_count, truncated} document, indented like json.dumps(indent=2) but with one row per line."""
+        names = json.dumps([c.name for c in self.columns], ensure_ascii=False)
+        if self.row_count:
+            tokens = [c.json_tokens() for c in self.columns]
+            data = "[\n    [" + "],\n    [".join(map(", ".join, zip(*tokens))) + "]\n  ]"
+        else:
+            data = "[]"
+        return (
+            '{\n  "columns": ' + names
+            + ',\n  "data": ' + data
+            + ',\n  "row_count": ' + str(self.row_count)
+            + ',\n  "truncated": ' + ("true" if self.truncated else "false")
+            + "\n}"
+        )
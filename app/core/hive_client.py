@@ -1,13 +1,20 @@
-from pyhive import hive
 from app.config import config
+from app.core.columnar import Column, ColumnarResult
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for rows requested per FetchResults call
+# (HiveServer2 caps this at hive.server2.thrift.resultset.max.fetch.size, 10000 by default)
+MAX_FETCH_BATCH = 10000
+
 def get_hive_connection(database: str = None):
     """
     Creates and returns a new Hive connection.
     """
+    # PyHive/Thrift are imported on first use so server startup does not pay for them.
+    from pyhive import hive
+
     db = database or config.hive.database
     
     conn_kwargs = {
@@ -22,35 +29,111 @@ def get_hive_connection(database: str = None):
     
     return hive.Connection(**conn_kwargs)
 
-def execute_query(query: str, database: str = None, max_rows: int = 1000) -> dict:
+def check_connection():
+    """
+    Opens and closes a Hive connection. Raises if HiveServer2 is unreachable.
+    """
+    conn = get_hive_connection()
+    try:
+        conn.cursor()
+    finally:
+        conn.close()
+
+def fetch_rows(cursor, max_rows: int = None) -> dict:
+    """
+    Reads the result set of an executed cursor through PyHive's row tuples.
+
+    This is the path fetch_columns replaced; benchmarks/bench_fetch.py compares the two.
+    """
+    columns = [desc[0] for desc in cursor.description] if cursor.description else []
+
+    truncated = False
+    if max_rows is not None:
+        rows = cursor.fetchmany(max_rows + 1)
+        if len(rows) > max_rows:
+            truncated = True
+            rows = rows[:max_rows]
+    else:
+        rows = cursor.fetchall()
+
+    return {
+        "columns": columns,
+        "data": rows,
+        "row_count": len(rows),
+        "truncated": truncated,
+    }
+
+def _fetch_rowset(cursor, max_rows: int):
+    """
+    Sends one TFetchResultsReq on a PyHive cursor and returns the TRowSet,
+    or None if the operation has no result set.
+
+    This is the only place that touches PyHive internals (cursor._operationHandle,
+    cursor._connection.client, pyhive.hive._check_status). They are pinned to
+    PyHive==0.7.0 in requirements.txt; re-check this function when upgrading.
     """
-    Executes a Hive query and returns the results.
+    from TCLIService import ttypes
+    from pyhive.hive import _check_status
+
+    handle = cursor._operationHandle
+    if handle is None or not handle.hasResultSet:
+        return None
+    req = ttypes.TFetchResultsReq(
+        operationHandle=handle,
+        orientation=ttypes.TFetchOrientation.FETCH_NEXT,
+        maxRows=max_rows,
+    )
+    response = cursor._connection.client.FetchResults(req)
+    _check_status(response)
+    if response.results.rows and not response.results.columns:
+        raise ValueError("HiveServer2 returned row-based results; expected columnar format")
+    return response.results
+
+def fetch_columns(cursor, max_rows: int = None) -> ColumnarResult:
+    """
+    Reads the result set of an executed cursor as columns.
+
+    TRowSet column batches are appended to typed arrays as they arrive, skipping
+    PyHive's per-row tuples. Each FetchResults asks for just enough rows to fill
+    max_rows (plus one to detect truncation).
+    """
+    description = cursor.description or []
+    columns = [Column(desc[0]) for desc in description]
+    if not columns:
+        return ColumnarResult(columns)
+
+    wanted = max_rows + 1 if max_rows is not None else None
+    fetched = 0
+    while wanted is None or fetched < wanted:
+        batch = MAX_FETCH_BATCH if wanted is None else min(wanted - fetched, MAX_FETCH_BATCH)
+        rowset = _fetch_rowset(cursor, batch)
+        if rowset is None:
+            break
+        added = 0
+        for column, tcolumn in zip(columns, rowset.columns or []):
+            added = column.append_tcolumn(tcolumn)
+        if not added:
+            break
+        fetched += added
+
+    truncated = max_rows is not None and fetched > max_rows
+    if truncated:
+        for column in columns:
+            column.truncate(max_rows)
+    return ColumnarResult(columns, truncated)
+
+def execute_query_columnar(query: str, database: str = None, max_rows: int = 1000) -> ColumnarResult:
+    """
+    Executes a Hive query and returns the results as columns (see fetch_columns).
     """
     conn = None
     try:
         conn = get_hive_connection(database)
         cursor = conn.cursor()
         cursor.execute(query)
-
-        columns = [desc[0] for desc in cursor.description] if cursor.description else []
-        
-        truncated = False
-        if max_rows is not None:
-            rows = cursor.fetchmany(max_rows + 1)
-            if len(rows) > max_rows:
-                truncated = True
-                rows = rows[:max_rows]
-        else:
-            rows = cursor.fetchall()
-
-        return {
-            "columns": columns,
-            "data": rows,
-            "row_count": len(rows),
-            "truncated": truncated,
-        }
+        return fetch_columns(cursor, max_rows)
     except Exception as e:
-        logger.error(f"Hive query failed: {e}")
+        logger.error("Hive query failed", extra={"sql": query, "fields": {"error": str(e)}})
         raise e
     finally:
         if conn:
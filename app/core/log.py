@@ -0,0 +1,186 @@
+import re
+import sys
+import json
+import time
+import queue
+import atexit
+import random
+import hashlib
+import logging
+import functools
+import threading
+import logging.handlers
+from typing import Dict, Optional
+
+_CATEGORY_ERROR = "error"
+
+_SQL_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_SQL_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SQL_SPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def sql_fingerprint(query: str) -> str:
+    """Stable short hash of a query with literals and whitespace normalised away."""
+    normalized = _SQL_STRING.sub("?", query)
+    normalized = _SQL_NUMBER.sub("?", normalized)
+    normalized = _SQL_SPACE.sub(" ", normalized).strip().lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def sql_fields(query: str, max_chars: int) -> Dict[str, object]:
+    """Log fields for a query: truncated text, original length and fingerprint."""
+    fields = {"sql_len": len(query), "sql_fingerprint": sql_fingerprint(query)}
+    if max_chars and len(query) > max_chars:
+        fields["sql"] = query[:max_chars] + "..."
+        fields["sql_truncated"] = True
+    else:
+        fields["sql"] = query
+    return fields
+
+
+class CategoryLimiter:
+    """Random sampling plus a token-bucket rate limit for one log category."""
+
+    def __init__(self, sample_rate: float = 1.0, rate_limit: Optional[float] = None):
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self._tokens = rate_limit or 0.0
+        self._last = time.monotonic()
+        self._suppressed = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[int]:
+        """Return None to drop the record, else the number of records dropped since the last one kept."""
+        with self._lock:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                self._suppressed += 1
+                return None
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._last) * self.rate_limit)
+                self._last = now
+                if self._tokens < 1.0:
+                    self._suppressed += 1
+                    return None
+                self._tokens -= 1.0
+            suppressed, self._suppressed = self._suppressed, 0
+            return suppressed
+
+
+class SamplingFilter(logging.Filter):
+    """Drops records per category before they are queued.
+
+    The category comes from `extra={"category": ...}`; uncategorised ERROR records
+    fall into the "error" category, everything else passes through.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, CategoryLimiter]] = None):
+        super().__init__()
+        self.limits = limits or {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+        if category is None and record.levelno >= logging.ERROR:
+            category = _CATEGORY_ERROR
+        limiter = self.limits.get(category)
+        if limiter is None:
+            return True
+        suppressed = limiter.allow()
+        if suppressed is None:
+            return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line. Runs on the listener thread, off the event loop."""
+
+    def __init__(self, max_query_chars: int = 500):
+        super().__init__()
+        self.max_query_chars = max_query_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        category = getattr(record, "category", None)
+        if category:
+            entry["category"] = category
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        sql = getattr(record, "sql", None)
+        if sql is not None:
+            entry.update(sql_fields(sql, self.max_query_chars))
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve the message and traceback here; JSON encoding is left
+        # to the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_sampling_filter = SamplingFilter()
+_formatter = JsonFormatter()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: str = "INFO", limits: Optional[Dict[str, CategoryLimiter]] = None,
+                  max_query_chars: int = 500, stream=None) -> logging.handlers.QueueListener:
+    """Route the root logger through a queue to a background thread writing JSON lines."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(_formatter)
+    update_limits(limits or {}, max_query_chars)
+
+    log_queue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(_sampling_filter)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def update_limits(limits: Dict[str, CategoryLimiter], max_query_chars: Optional[int] = None):
+    """Swap the per-category limits, e.g. after a config reload."""
+    _sampling_filter.limits = limits
+    if max_query_chars is not None:
+        _formatter.max_query_chars = max_query_chars
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
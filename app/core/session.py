@@ -19,4 +19,9 @@ class SessionManager:
         if session_id in self.sessions:
             del self.sessions[session_id]
 
+    def broadcast(self, message: dict):
+        """Queue a message (e.g. a notification) on every live session."""
+        for queue in self.sessions.values():
+            queue.put_nowait(message)
+
 session_manager = SessionManager()
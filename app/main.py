@@ -1,23 +1,42 @@
+import time
+_process_start = time.perf_counter()
+
 import json
+import signal
 import logging
 import asyncio
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.config import config
-from app.tools.registry import registry
+from app.config import config, config_mtime, reload_config
+from app.core.hive_client import check_connection
+from app.tools.registry import registry, ToolArgumentError
 # Import tools to register them
 import app.tools.hive_tools
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from app.core.log import CategoryLimiter, setup_logging, update_limits
+
+def _log_limits():
+    return {
+        name: CategoryLimiter(c.sample_rate, c.rate_limit)
+        for name, c in (("access", config.logging.access), ("query", config.logging.query), ("error", config.logging.error))
+    }
+
+# Configure logging: JSON lines written from a background thread, sampled per category
+setup_logging(config.logging.level, _log_limits(), config.logging.max_query_chars)
 logger = logging.getLogger(__name__)
 
 from app.core.session import session_manager
 
 app = FastAPI(title="Hive MCP Server")
 
+def _notify_tools_changed():
+    session_manager.broadcast({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+
+# Registered after the built-in tools are imported, so only later changes notify clients
+registry.add_listener(_notify_tools_changed)
+
 # CORS Middleware
 origins = config.allowed_origins or ["*"]
 
@@ -36,9 +55,97 @@ def _origin_allowed(origin):
         return True
     return origin in config.allowed_origins
 
+# How often the config file is checked for changes
+CONFIG_POLL_SECONDS = 2.0
+# How often an unreachable HiveServer2 is re-probed
+READINESS_RETRY_SECONDS = 15.0
+# How often a reachable HiveServer2 is re-probed
+READINESS_INTERVAL_SECONDS = 60.0
+
+readiness = {"ready": False, "checked_at": None, "error": None}
+startup_ms = None
+_reprobe = asyncio.Event()
+_background_tasks = []
+
+async def readiness_probe():
+    """Probe HiveServer2 in the background so a slow server never delays startup."""
+    while True:
+        _reprobe.clear()
+        try:
+            await asyncio.to_thread(check_connection)
+            readiness.update(ready=True, error=None)
+            logger.info("HiveServer connection test successful.")
+        except Exception as e:
+            readiness.update(ready=False, error=str(e))
+            logger.error(f"HiveServer connection test failed: {e}")
+        readiness["checked_at"] = time.time()
+
+        # Re-probe on an interval (sooner while unreachable) or right after a config reload.
+        timeout = READINESS_INTERVAL_SECONDS if readiness["ready"] else READINESS_RETRY_SECONDS
+        try:
+            await asyncio.wait_for(_reprobe.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+def apply_config_reload(reason: str):
+    """Reload config.json in place. Live SSE sessions are left untouched."""
+    old_server = config.server.model_copy()
+    old_origins = config.allowed_origins
+    try:
+        changed = reload_config()
+    except FileNotFoundError:
+        logger.warning(f"Config reload skipped ({reason}): config.json not found, keeping current config")
+        return
+    except Exception as e:
+        logger.error(f"Config reload failed ({reason}): {e}")
+        return
+    if not changed:
+        return
+
+    update_limits(_log_limits(), config.logging.max_query_chars)
+    logging.getLogger().setLevel(config.logging.level)
+    logger.info("config_reloaded", extra={"fields": {"event": "config_reloaded", "reason": reason, "config": config.mask_secrets()}})
+    if (old_server.host, old_server.port) != (config.server.host, config.server.port):
+        logger.warning("server.host/server.port changed; restart required for the new bind address to take effect.")
+    if old_origins != config.allowed_origins:
+        # CORSMiddleware keeps the origin list it was built with
+        logger.warning("allowed_origins changed; restart required for CORS headers to use the new list.")
+    # Connections are built from config on each call, so only readiness needs refreshing.
+    _reprobe.set()
+
+async def watch_config():
+    last_mtime = config_mtime()
+    while True:
+        await asyncio.sleep(CONFIG_POLL_SECONDS)
+        try:
+            mtime = config_mtime()
+            if mtime != last_mtime:
+                last_mtime = mtime
+                apply_config_reload("file_changed")
+        except Exception as e:
+            # Keep watching; a later edit may fix whatever went wrong
+            logger.error(f"Config watcher error: {e}")
+
 @app.on_event("startup")
 async def startup_event():
-    logger.info(json.dumps({"event": "config_loaded", "config": config.mask_secrets()}, ensure_ascii=False))
+    global startup_ms
+    logger.info("config_loaded", extra={"fields": {"event": "config_loaded", "config": config.mask_secrets()}})
+
+    _background_tasks.append(asyncio.create_task(readiness_probe()))
+    _background_tasks.append(asyncio.create_task(watch_config()))
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, apply_config_reload, "sighup")
+    except (AttributeError, NotImplementedError, RuntimeError):
+        # No SIGHUP on this platform; file watching still applies.
+        pass
+
+    startup_ms = round((time.perf_counter() - _process_start) * 1000, 1)
+    logger.info("startup_complete", extra={"fields": {"event": "startup_complete", "startup_ms": startup_ms}})
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in _background_tasks:
+        task.cancel()
 
 # SSE Endpoint for standard MCP clients
 @app.get("/sse")
@@ -126,6 +233,10 @@ async def mcp_post(request: Request):
     except json.JSONDecodeError:
         return Response(status_code=400)
 
+    if (isinstance(rpc_message, dict) and rpc_message.get('method') == 'tools/list'
+            and rpc_message.get('id') is not None):
+        return _tools_list_response(rpc_message['id'])
+
     if 'method' in rpc_message:
         request_id = rpc_message.get('id')
         try:
@@ -167,6 +278,16 @@ async def mcp_post(request: Request):
     else:
         return Response(status_code=202)
 
+def _tools_list_response(request_id):
+    """Serve tools/list from the registry's pre-serialized result.
+
+    The ETag header lets clients tell whether the tool list changed; every
+    request still gets a full JSON-RPC response.
+    """
+    body = '{"jsonrpc": "2.0", "result": %s, "id": %s}' % (
+        registry.list_tools_json(), json.dumps(request_id, ensure_ascii=False))
+    return Response(content=body, media_type="application/json", headers={"ETag": registry.etag})
+
 @app.get("/mcp")
 async def mcp_get(request: Request):
     """MCP endpoint supporting SSE for clients connecting to /mcp"""
@@ -210,6 +331,12 @@ async def mcp_get(request: Request):
 async def root():
     return {"status": "online", "service": "Hive MCP Server"}
 
+@app.get("/ready")
+async def ready():
+    """Readiness check: 200 once HiveServer2 has been reached, 503 otherwise."""
+    content = dict(readiness, startup_ms=startup_ms)
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=content)
+
 async def handle_rpc_request(rpc):
     # Remove try/catch here to let exceptions propagate to mcp_post
     method = rpc.get('method')
@@ -219,7 +346,7 @@ async def handle_rpc_request(rpc):
         return {
             'protocolVersion': '2024-11-05',
             'capabilities': {
-                'tools': {}
+                'tools': {'listChanged': True}
             },
             'serverInfo': {
                 'name': 'Hive MCP Server',
@@ -232,14 +359,20 @@ async def handle_rpc_request(rpc):
     elif method == 'ping':
         return {}
     elif method == 'tools/list':
-        return {
-            'tools': [t.model_dump() for t in registry.get_definitions()]
-        }
+        return registry.list_tools_result()
     elif method == 'tools/call':
         tool_name = params.get('name')
         arguments = params.get('arguments', {})
         try:
             return await registry.call_tool(tool_name, arguments)
+        except ToolArgumentError as e:
+            return {
+                'content': [{
+                    'type': 'text',
+                    'text': json.dumps({"error": str(e)}, ensure_ascii=False)
+                }],
+                'isError': True
+            }
         except ValueError:
              return {
                 'content': [{
@@ -261,24 +394,23 @@ async def handle_rpc_request(rpc):
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"Access: {request.method} {request.url} from {request.client.host}")
+    start = time.perf_counter()
     response = await call_next(request)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("access", extra={"category": "access", "fields": {
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "client": request.client.host if request.client else None,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        }})
     return response
 
 if __name__ == "__main__":
     import uvicorn
     import socket
-    
-    # Check connection on startup
-    try:
-        from app.core.hive_client import get_hive_connection
-        conn = get_hive_connection()
-        conn.cursor()
-        conn.close()
-        logger.info("HiveServer connection test successful.")
-    except Exception as e:
-        logger.error(f"HiveServer connection test failed: {e}")
 
+    # HiveServer connectivity is checked in the background (see /ready)
     host = config.server.host
     port = config.server.port
     
@@ -299,10 +431,11 @@ if __name__ == "__main__":
         sock = None
 
     if sock:
-        # Run with the pre-opened dual-stack socket
-        uvicorn.run(app, fd=sock.fileno())
+        # Run with the pre-opened dual-stack socket.
+        # log_config=None keeps uvicorn on our queued handler; access lines come from log_requests
+        uvicorn.run(app, fd=sock.fileno(), access_log=False, log_config=None)
     else:
         # Fallback to standard binding
         if host == '::':
              host = '0.0.0.0' # Fallback for safety if :: failed
-        uvicorn.run(app, host=host, port=port)
+        uvicorn.run(app, host=host, port=port, access_log=False, log_config=None)
@@ -1,12 +1,16 @@
 import asyncio
 import json
 from app.tools.registry import registry
-from app.core.hive_client import execute_query
+from app.core.hive_client import execute_query_columnar
 from app.config import config
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _run_query(query: str, database: str = None, max_rows: int = 1000) -> str:
+    """Runs a query and encodes the result, both off the event loop."""
+    return execute_query_columnar(query, database, max_rows).to_json()
+
 @registry.register(
     name="query_hive",
     description="Executes a raw Hive SQL query. Use this for complex queries, Joins, Aggregations, or DDL operations that are not covered by other specialized tools. NOT recommended for simple table listings or schema checks.",
@@ -23,6 +27,7 @@ logger = logging.getLogger(__name__)
             },
             "max_rows": {
                 "type": "integer",
+                "minimum": 1,
                 "description": "Optional: maximum number of rows returned (default 1000)"
             }
         },
@@ -36,30 +41,21 @@ async def query_hive(query: str, database: str = None, max_rows: int = None):
     
     db = database or config.hive.database
     
-    # Resolve max_rows
-    server_max = config.server.max_rows
+    # Resolve max_rows (already validated as an integer >= 1 by the registry)
     if max_rows is None:
-        limit = server_max
+        limit = config.server.max_rows
     else:
-        try:
-            limit = int(max_rows)
-        except Exception:
-            limit = server_max
-        
-        if limit <= 0:
-            limit = server_max
-        if limit > 10000: # Hard cap
-            limit = 10000
+        limit = min(max_rows, 10000) # Hard cap
 
-    logger.info(f"Executing Hive query: {query} on db: {db}")
+    logger.info("Executing Hive query", extra={"category": "query", "sql": query, "fields": {"db": db, "max_rows": limit}})
     
     try:
         # Run blocking hive query in thread pool
-        result = await asyncio.to_thread(execute_query, query, db, limit)
+        text = await asyncio.to_thread(_run_query, query, db, limit)
         return {
             "content": [{
                 "type": "text",
-                "text": json.dumps(result, ensure_ascii=False, indent=2, default=str)
+                "text": text
             }]
         }
     except Exception as e:
@@ -97,18 +93,18 @@ async def get_table_schema(table_name: str, database: str = None):
         
     query = f"DESCRIBE FORMATTED {full_table_name}"
     
-    logger.info(f"Getting schema for table: {full_table_name}")
+    logger.info("Getting table schema", extra={"category": "query", "fields": {"table": full_table_name}})
     
     try:
         # We use a larger limit for schema to ensure we get all fields
-        result = await asyncio.to_thread(execute_query, query, None, 10000)
+        text = await asyncio.to_thread(_run_query, query, None, 10000)
         
         # We could parse the 'result' here to make it even more structured JSON
         # For now, returning the formatted output is already a big improvement
         return {
             "content": [{
                 "type": "text",
-                "text": json.dumps(result, ensure_ascii=False, indent=2, default=str)
+                "text": text
             }]
         }
     except Exception as e:
@@ -145,14 +141,14 @@ async def list_tables(database: str = None, search_pattern: str = None):
     else:
         query = f"SHOW TABLES IN {db}"
         
-    logger.info(f"Listing tables in {db} with pattern {search_pattern}")
+    logger.info("Listing tables", extra={"category": "query", "fields": {"db": db, "pattern": search_pattern}})
     
     try:
-        result = await asyncio.to_thread(execute_query, query, db, 10000)
+        text = await asyncio.to_thread(_run_query, query, db, 10000)
         return {
             "content": [{
                 "type": "text",
-                "text": json.dumps(result, ensure_ascii=False, indent=2, default=str)
+                "text": text
             }]
         }
     except Exception as e:
@@ -175,6 +171,7 @@ async def list_tables(database: str = None, search_pattern: str = None):
             },
             "limit": {
                 "type": "integer",
+                "minimum": 1,
                 "description": "Number of rows to return (default 10, max 100)"
             },
             "database": {
@@ -196,14 +193,14 @@ async def preview_table(table_name: str, limit: int = 10, database: str = None):
         
     query = f"SELECT * FROM {full_table_name} LIMIT {limit}"
     
-    logger.info(f"Previewing table: {full_table_name} limit {limit}")
+    logger.info("Previewing table", extra={"category": "query", "fields": {"table": full_table_name, "limit": limit}})
     
     try:
-        result = await asyncio.to_thread(execute_query, query, None, limit)
+        text = await asyncio.to_thread(_run_query, query, None, limit)
         return {
             "content": [{
                 "type": "text",
-                "text": json.dumps(result, ensure_ascii=False, indent=2, default=str)
+                "text": text
             }]
         }
     except Exception as e:
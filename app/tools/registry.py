@@ -1,11 +1,124 @@
+import json
+import hashlib
 import inspect
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 from app.core.mcp_types import ToolDefinition, ToolInputSchema
 
+class ToolArgumentError(Exception):
+    """Raised when tool arguments do not match the tool's input schema."""
+
+def _coerce_string(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise TypeError("expected string")
+
+def _coerce_integer(value):
+    if isinstance(value, bool):
+        raise TypeError("expected integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return int(value.strip())
+    raise TypeError("expected integer")
+
+def _coerce_number(value):
+    if isinstance(value, bool):
+        raise TypeError("expected number")
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        return float(value.strip())
+    raise TypeError("expected number")
+
+def _coerce_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    raise TypeError("expected boolean")
+
+def _expect(kind):
+    def check(value):
+        if not isinstance(value, kind):
+            raise TypeError(f"expected {kind.__name__}")
+        return value
+    return check
+
+_COERCERS = {
+    "string": _coerce_string,
+    "integer": _coerce_integer,
+    "number": _coerce_number,
+    "boolean": _coerce_boolean,
+    "object": _expect(dict),
+    "array": _expect(list),
+}
+
+def _compile_property(name: str, prop: Dict[str, Any]) -> Callable[[Any], Any]:
+    """Build a single function that coerces and checks one argument."""
+    expected = prop.get("type")
+    coerce = _COERCERS.get(expected, lambda value: value)
+    enum = prop.get("enum")
+    minimum = prop.get("minimum")
+    maximum = prop.get("maximum")
+
+    def validate(value):
+        try:
+            value = coerce(value)
+        except (TypeError, ValueError):
+            raise ToolArgumentError(f"Invalid argument '{name}': expected {expected}") from None
+        if enum is not None and value not in enum:
+            raise ToolArgumentError(f"Invalid argument '{name}': must be one of {enum}")
+        if minimum is not None and value < minimum:
+            raise ToolArgumentError(f"Invalid argument '{name}': must be >= {minimum}")
+        if maximum is not None and value > maximum:
+            raise ToolArgumentError(f"Invalid argument '{name}': must be <= {maximum}")
+        return value
+    return validate
+
+class ArgumentValidator:
+    """Validates and coerces call arguments against a compiled input schema."""
+
+    def __init__(self, input_schema: Dict[str, Any]):
+        self.required = tuple(input_schema.get("required") or ())
+        self.properties = {
+            name: _compile_property(name, prop)
+            for name, prop in (input_schema.get("properties") or {}).items()
+        }
+
+    def __call__(self, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if arguments is None:
+            arguments = {}
+        elif not isinstance(arguments, dict):
+            raise ToolArgumentError("Tool arguments must be an object")
+
+        for name in self.required:
+            if arguments.get(name) is None:
+                raise ToolArgumentError(f"Missing required argument '{name}'")
+
+        validated = {}
+        for name, value in arguments.items():
+            validate = self.properties.get(name)
+            if validate is None:
+                raise ToolArgumentError(f"Unexpected argument '{name}'")
+            # Optional arguments sent as null fall back to the tool's default
+            if value is not None:
+                validated[name] = validate(value)
+        return validated
+
 class ToolRegistry:
     def __init__(self):
         self._tools: Dict[str, Callable] = {}
         self._definitions: Dict[str, ToolDefinition] = {}
+        self._validators: Dict[str, ArgumentValidator] = {}
+        self._is_async: Dict[str, bool] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._list_result: Optional[Dict[str, Any]] = None
+        self._list_json: Optional[str] = None
+        self._etag: Optional[str] = None
 
     def register(self, name: str, description: str, input_schema: Dict[str, Any]):
         def decorator(func: Callable):
@@ -15,24 +128,70 @@ class ToolRegistry:
                 description=description,
                 inputSchema=ToolInputSchema(**input_schema)
             )
+            self._validators[name] = ArgumentValidator(input_schema)
+            self._is_async[name] = inspect.iscoroutinefunction(func)
+            self._changed()
             return func
         return decorator
 
+    def unregister(self, name: str):
+        if self._tools.pop(name, None) is None:
+            return
+        del self._definitions[name]
+        del self._validators[name]
+        del self._is_async[name]
+        self._changed()
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Call `callback` whenever the set of tools changes."""
+        self._listeners.append(callback)
+
+    def _changed(self):
+        self._list_result = None
+        self._list_json = None
+        self._etag = None
+        for callback in self._listeners:
+            callback()
+
     def get_tool(self, name: str) -> Optional[Callable]:
         return self._tools.get(name)
 
     def get_definitions(self) -> list[ToolDefinition]:
         return list(self._definitions.values())
 
+    def list_tools_result(self) -> Dict[str, Any]:
+        """The `tools/list` result, built once per change to the registry."""
+        if self._list_result is None:
+            self._list_result = {
+                'tools': [t.model_dump() for t in self._definitions.values()]
+            }
+        return self._list_result
+
+    def list_tools_json(self) -> str:
+        """`list_tools_result()` serialized to JSON, cached alongside it."""
+        if self._list_json is None:
+            self._list_json = json.dumps(self.list_tools_result(), ensure_ascii=False)
+        return self._list_json
+
+    @property
+    def etag(self) -> str:
+        """Content hash of the current tool list, usable as an HTTP ETag."""
+        if self._etag is None:
+            digest = hashlib.sha1(self.list_tools_json().encode("utf-8")).hexdigest()[:16]
+            self._etag = f'"{digest}"'
+        return self._etag
+
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         func = self.get_tool(name)
         if not func:
             raise ValueError(f"Tool {name} not found")
-        
-        # Check if function is async
-        if inspect.iscoroutinefunction(func):
-            return await func(**arguments)
+
+        # Rejects bad calls before they reach the tool (and its worker thread)
+        kwargs = self._validators[name](arguments)
+
+        if self._is_async[name]:
+            return await func(**kwargs)
         else:
-            return func(**arguments)
+            return func(**kwargs)
 
 registry = ToolRegistry()
@@ -0,0 +1,63 @@
+"""
+tools/list and tools/call dispatch overhead.
+
+Compares rebuilding the tools/list payload with model_dump() on every request
+against the registry's cached result/JSON, and measures argument validation
+cost per tools/call. No HiveServer2 is needed; a no-op tool is dispatched.
+
+    python -m benchmarks.bench_dispatch [iterations]
+"""
+import sys
+import json
+import time
+import asyncio
+
+from app.tools.registry import registry
+import app.tools.hive_tools  # noqa: F401  register the real tool definitions
+
+
+@registry.register(
+    name="bench_noop",
+    description="No-op tool used for dispatch benchmarks",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "table_name": {"type": "string"},
+            "limit": {"type": "integer"},
+            "database": {"type": "string"},
+        },
+        "required": ["table_name"]
+    }
+)
+async def bench_noop(table_name: str, limit: int = 10, database: str = None):
+    return None
+
+
+def timed(label, n, func):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed / n * 1e6:>9.2f} us/op")
+
+
+async def _calls(n, arguments):
+    for _ in range(n):
+        await registry.call_tool("bench_noop", arguments)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    timed("tools/list rebuilt + json.dumps", n,
+          lambda: json.dumps({'tools': [t.model_dump() for t in registry.get_definitions()]}, ensure_ascii=False))
+    timed("tools/list cached JSON", n, registry.list_tools_json)
+
+    arguments = {"table_name": "db.t", "limit": "50", "database": None}
+    start = time.perf_counter()
+    asyncio.run(_calls(n, arguments))
+    print(f"{'tools/call validated dispatch':<36} {(time.perf_counter() - start) / n * 1e6:>9.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
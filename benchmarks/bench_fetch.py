@@ -0,0 +1,142 @@
+"""
+Row-tuple fetch path vs columnar fetch path.
+
+A PyHive cursor is pointed at a fake HiveServer2 client that serves synthetic
+TRowSet batches (bigint, int, double, boolean and string columns with some
+nulls). The previous row path (fetch_rows + json.dumps) is timed against
+fetch_columns + ColumnarResult.to_json, and both outputs are checked to
+decode to the same document, including for server batches that do not
+line up with the 8-row null bitmap bytes.
+
+    python -m benchmarks.bench_fetch [rows] [width]
+"""
+import sys
+import json
+import time
+import random
+
+from pyhive import hive
+from TCLIService import ttypes
+
+import app.core.hive_client as hive_client
+from app.core.hive_client import fetch_columns, fetch_rows
+
+_SUCCESS = ttypes.TStatus(statusCode=ttypes.TStatusCode.SUCCESS_STATUS)
+
+# (Hive type, TColumn field, TColumn value class, value generator)
+_KINDS = [
+    ("BIGINT_TYPE", "i64Val", ttypes.TI64Column, lambda r, i: r.randrange(-2**40, 2**40)),
+    ("INT_TYPE", "i32Val", ttypes.TI32Column, lambda r, i: r.randrange(-2**31, 2**31)),
+    ("DOUBLE_TYPE", "doubleVal", ttypes.TDoubleColumn, lambda r, i: r.random() * 1000),
+    ("BOOLEAN_TYPE", "boolVal", ttypes.TBoolColumn, lambda r, i: r.random() < 0.5),
+    ("STRING_TYPE", "stringVal", ttypes.TStringColumn, lambda r, i: f"value_{i}_é"),
+]
+
+
+def _bitmap(flags):
+    out = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            out[i >> 3] |= 1 << (i & 7)
+    return bytes(out)
+
+
+class FakeClient:
+    """Serves a synthetic table in TRowSet batches of the requested size."""
+
+    def __init__(self, rows, width, seed=0):
+        rnd = random.Random(seed)
+        self.schema = []
+        self.data = []
+        for c in range(width):
+            type_name, field, cls, gen = _KINDS[c % len(_KINDS)]
+            values = [gen(rnd, i) for i in range(rows)]
+            nulls = [rnd.random() < 0.05 for _ in range(rows)]
+            self.schema.append((f"col_{c}", type_name, field, cls))
+            self.data.append((values, nulls))
+        self.rows = rows
+        self.offset = 0
+        self._bitmaps = {}
+
+    def FetchResults(self, req):
+        start, end = self.offset, min(self.offset + req.maxRows, self.rows)
+        self.offset = end
+        if (start, end) not in self._bitmaps:
+            self._bitmaps[start, end] = [_bitmap(nulls[start:end]) for _, nulls in self.data]
+        columns = []
+        # Value lists are sliced fresh each call: PyHive overwrites nulls in place
+        for (_, _, field, cls), (values, _), nulls in zip(self.schema, self.data, self._bitmaps[start, end]):
+            wrapper = cls(values=values[start:end], nulls=nulls)
+            columns.append(ttypes.TColumn(**{field: wrapper}))
+        return ttypes.TFetchResultsResp(status=_SUCCESS, results=ttypes.TRowSet(startRowOffset=start, columns=columns))
+
+
+class FakeConnection:
+    def __init__(self, client):
+        self.client = client
+
+
+def make_cursor(client):
+    client.offset = 0
+    cursor = hive.Cursor(FakeConnection(client))
+    cursor._operationHandle = ttypes.TOperationHandle(hasResultSet=True)
+    cursor._state = cursor._STATE_RUNNING
+    cursor._description = [(name, type_name, None, None, None, None, True)
+                           for name, type_name, _, _ in client.schema]
+    return cursor
+
+
+def row_path(cursor, max_rows):
+    return json.dumps(fetch_rows(cursor, max_rows), ensure_ascii=False, indent=2, default=str)
+
+
+def columnar_path(cursor, max_rows):
+    return fetch_columns(cursor, max_rows).to_json()
+
+
+def bench(label, path, client, max_rows, repeat=5):
+    best = None
+    width = len(client.schema)
+    for _ in range(repeat):
+        cursor = make_cursor(client)
+        start = time.perf_counter()
+        text = path(cursor, max_rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<22} {best * 1000:>9.1f} ms   {max_rows * width / best / 1e6:>6.2f} M cells/s")
+    return text
+
+
+def check_unaligned_batches():
+    """Columnar output must match the row path when batches split null bitmap bytes."""
+    default_batch = hive_client.MAX_FETCH_BATCH
+    try:
+        for batch in (13, 8, 1):
+            hive_client.MAX_FETCH_BATCH = batch
+            for rows, max_rows in ((100, 37), (100, 100), (100, 500), (0, 10)):
+                client = FakeClient(rows, 6, seed=batch)
+                before = row_path(make_cursor(client), max_rows)
+                after = columnar_path(make_cursor(client), max_rows)
+                assert json.loads(before) == json.loads(after), \
+                    f"columnar output differs (batch={batch}, rows={rows}, max_rows={max_rows})"
+    finally:
+        hive_client.MAX_FETCH_BATCH = default_batch
+    print("unaligned batch check passed")
+
+
+def main():
+    check_unaligned_batches()
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    max_rows = rows - 1  # exercise truncation
+    print(f"{max_rows} rows x {width} columns")
+
+    client = FakeClient(rows, width)
+    before = bench("row tuples", row_path, client, max_rows)
+    after = bench("columnar", columnar_path, client, max_rows)
+    assert json.loads(before) == json.loads(after), "columnar output differs from row path"
+
+
+if __name__ == "__main__":
+    main()
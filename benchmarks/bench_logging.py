@@ -0,0 +1,78 @@
+"""
+Logging overhead on the request hot path.
+
+Emits access/query records the way the server does and reports calling-thread
+throughput with logging off, with the old basicConfig StreamHandler, and with
+the queued JSON pipeline (unlimited and with the default sampling limits).
+
+    python -m benchmarks.bench_logging [records]
+"""
+import os
+import sys
+import time
+import logging
+
+from app.core.log import CategoryLimiter, setup_logging, stop_logging
+
+QUERY = "SELECT a, b, c FROM db.wide_table WHERE dt = '2024-01-01' AND id IN (1, 2, 3) " * 20
+
+logger = logging.getLogger("bench")
+
+
+def _reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+def emit_legacy(n):
+    for i in range(n):
+        logger.info(f"Access: POST http://localhost:8008/messages?session_id={i} from 127.0.0.1")
+        logger.info(f"Executing Hive query: {QUERY} on db: default")
+
+
+def emit_structured(n):
+    for i in range(n):
+        logger.info("access", extra={"category": "access", "fields": {
+            "method": "POST", "path": "/messages", "status": 202, "client": "127.0.0.1", "duration_ms": 0.5,
+        }})
+        logger.info("Executing Hive query", extra={"category": "query", "sql": QUERY, "fields": {"db": "default"}})
+
+
+def run(label, emit, n):
+    start = time.perf_counter()
+    emit(n)
+    emitted = time.perf_counter() - start
+    stop_logging()
+    drained = time.perf_counter() - start
+    _reset_root()
+    print(f"{label:<28} {2 * n / emitted:>12,.0f} rec/s on caller   {drained:>7.3f}s incl. drain")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    devnull = open(os.devnull, "w")
+
+    _reset_root()
+    logging.disable(logging.CRITICAL)
+    run("logging off", emit_structured, n)
+    logging.disable(logging.NOTSET)
+
+    logging.basicConfig(level=logging.INFO, stream=devnull,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', force=True)
+    run("basicConfig (before)", emit_legacy, n)
+
+    setup_logging("INFO", {}, 500, stream=devnull)
+    run("queued JSON, unlimited", emit_structured, n)
+
+    setup_logging("INFO", {
+        "access": CategoryLimiter(rate_limit=100),
+        "query": CategoryLimiter(rate_limit=50),
+    }, 500, stream=devnull)
+    run("queued JSON, default limits", emit_structured, n)
+
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()